@@ -1,91 +1,287 @@
 from __future__ import annotations
 
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+import orjson
 import pandas as pd
 import requests
 import yfinance as yf
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, render_template, request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the numpy path is fine without it
+    njit = None
+
+try:
+    from requests_cache import CachedSession
+except ImportError:  # falls back to in-memory caching only
+    CachedSession = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # responses simply go out uncompressed
+    Compress = None
+
+try:
+    import ijson
+except ImportError:  # falls back to parsing the ticker file in one piece
+    ijson = None
 
 app = Flask(__name__)
+if Compress is not None:
+    # JSON payloads are dominated by repeated date strings and small floats
+    # that compress 5-10x; level 5 keeps the CPU cost negligible.
+    app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+    app.config["COMPRESS_LEVEL"] = 5
+    Compress(app)
+log = logging.getLogger(__name__)
+
+FETCH_TIMEOUT = 25
+FETCH_WORKERS = 10
+
+# Yahoo and SEC rate-limit per IP; with multiple worker threads fanning out,
+# uncoordinated calls trigger 429 cascades. Bound outbound concurrency per
+# provider instead.
+SEC_SEM = threading.BoundedSemaphore(4)
+YF_SEM = threading.BoundedSemaphore(6)
+
+
+def yf_limited(fn):
+    """Run a yfinance fetch under the Yahoo concurrency bound."""
+    with YF_SEM:
+        return fn()
+
+
+# Chart ranges the API accepts; the 2y default keeps the common-case payload
+# small, with longer ranges available on demand.
+CHART_PERIODS = frozenset({"1y", "2y", "5y", "10y", "max"})
+DEFAULT_CHART_PERIOD = "2y"
 
 SEC_TICKER_URL = "https://www.sec.gov/files/company_tickers.json"
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
 SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
 USER_AGENT = "StockPickerResearchBot/1.0 (demo@example.com)"
+# No explicit Host: the SEC session serves both www.sec.gov and data.sec.gov,
+# and requests derives the correct Host per URL.
+SEC_HEADERS = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+YAHOO_HEADERS = {"User-Agent": USER_AGENT}
 KROLL_ERP_SOURCE = "https://www.kroll.com/en/insights/publications/cost-of-capital-navigator"
 DEFAULT_ERP = 0.055
+CURRENT_DEBT_ROWS = ["Current Debt", "Current Debt And Capital Lease Obligation"]
+LONG_TERM_DEBT_ROWS = ["Long Term Debt", "Long Term Debt And Capital Lease Obligation"]
+
+# Candidate row labels for every FY line item, keyed by local name; each
+# statement is read in one batch pass over its map.
+INCOME_FY_LINES = {
+    "rev": ["Total Revenue"],
+    "cogs": ["Cost Of Revenue"],
+    "gross": ["Gross Profit"],
+    "sga": ["Selling General And Administration"],
+    "rnd": ["Research And Development"],
+    "ebit": ["Operating Income", "EBIT"],
+    "interest": ["Interest Expense", "Interest Expense Non Operating"],
+    "taxes": ["Tax Provision"],
+    "net_income": ["Net Income"],
+}
+
+BALANCE_FY_LINES = {
+    "cash": ["Cash Cash Equivalents And Short Term Investments", "Cash And Cash Equivalents"],
+    "ar": ["Accounts Receivable"],
+    "inventory": ["Inventory"],
+    "other_ca": ["Other Current Assets"],
+    "current_assets": ["Current Assets"],
+    "current_liab": ["Current Liabilities"],
+    "ap": ["Accounts Payable"],
+    "accrued": ["Accrued Expenses"],
+    "deferred": ["Deferred Revenue"],
+    "current_debt": CURRENT_DEBT_ROWS,
+    "ltd": LONG_TERM_DEBT_ROWS,
+    "lease": ["Operating Lease Liability", "Long Term Lease Liability"],
+    "total_assets": ["Total Assets"],
+    "equity": ["Stockholders Equity", "Total Equity Gross Minority Interest"],
+}
+
+CASHFLOW_FY_LINES = {
+    "cfo": ["Operating Cash Flow"],
+    "capex": ["Capital Expenditure"],
+    "da": ["Depreciation And Amortization", "Depreciation"],
+}
 DEFAULT_TERMINAL_GROWTH = 0.02
 DEFAULT_TAX_RATE = 0.21
 
 
 def safe_div(n: float | None, d: float | None) -> float | None:
-    if n is None or d is None or d == 0:
+    # `not d` covers both None and a zero denominator in one check.
+    if n is None or not d:
         return None
     return n / d
 
 
 def nm_ratio(n: float | None, d: float | None, require_positive_denominator: bool = False) -> float | str:
-    if n is None or d is None or d == 0:
-        return "N/M"
-    if require_positive_denominator and d <= 0:
-        return "N/M"
-    out = safe_div(n, d)
-    if out is None:
+    if n is None or not d or (require_positive_denominator and d <= 0):
         return "N/M"
-    return out
+    return n / d
 
 
 def nm_percent(n: float | None, d: float | None) -> str:
-    value = safe_div(n, d)
-    if value is None:
+    if n is None or not d:
         return "N/M"
-    return f"{value * 100:.2f}%"
+    return f"{n / d * 100:.2f}%"
 
 
-def get_sec_headers() -> dict[str, str]:
-    return {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate", "Host": "www.sec.gov"}
+# company_tickers.json is ~1MB and changes at most daily; cache the parsed
+# ticker -> CIK map for the process instead of re-downloading per request.
+TICKER_MAP_TTL = 86400.0
+_ticker_map: dict[str, str] = {}
+_ticker_map_expires = 0.0
+_ticker_map_lock = threading.Lock()
 
+# Submissions JSON only changes when the company files; cache per ticker.
+FILINGS_TTL = 3600.0
+_filings_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+_filings_lock = threading.Lock()
 
-def get_cik_for_ticker(ticker: str) -> str | None:
-    resp = requests.get(SEC_TICKER_URL, headers=get_sec_headers(), timeout=20)
+CACHE_PATH = "cache.sqlite"
+
+
+def make_sec_session() -> requests.Session:
+    """One pooled session per process: keep-alive avoids a TCP/TLS handshake
+    per SEC call, and the retry policy absorbs SEC's 429s and transient 5xx.
+
+    With requests-cache installed, responses also persist to SQLite across
+    restarts: submissions for an hour, company_tickers.json for a day.
+    """
+    if CachedSession is not None:
+        session = CachedSession(
+            CACHE_PATH,
+            backend="sqlite",
+            expire_after=FILINGS_TTL,
+            urls_expire_after={SEC_TICKER_URL: TICKER_MAP_TTL},
+        )
+    else:
+        session = requests.Session()
+    session.headers.update(SEC_HEADERS)
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        ),
+    )
+    return session
+
+
+SEC_SESSION = make_sec_session()
+
+# Statements and info change at most quarterly; give yfinance a disk-backed
+# session too when available (None lets yfinance use its default session).
+YF_SESSION = CachedSession(CACHE_PATH, backend="sqlite", expire_after=FILINGS_TTL) if CachedSession is not None else None
+
+
+def fetch_ticker_map() -> dict[str, str]:
+    """Download company_tickers.json and build the ticker -> CIK map.
+
+    With ijson available and a plain session, the body is parsed
+    incrementally off the wire, so only the final flat map is held in
+    memory rather than the full nested JSON document on top of it.
+
+    The streaming path must not run through a CachedSession: requests-cache
+    replays bodies it already decoded while the stored headers still say
+    Content-Encoding: gzip, so raw-stream reads double-decompress on a miss
+    and hit EOF on a hit. The cached session already spares the re-download,
+    so it parses the (disk-cached) body in one piece instead.
+    """
+    with SEC_SEM:
+        if ijson is not None and CachedSession is None:
+            with SEC_SESSION.get(SEC_TICKER_URL, timeout=20, stream=True) as resp:
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+                return {
+                    row["ticker"].upper(): str(row["cik_str"]).zfill(10)
+                    for _, row in ijson.kvitems(resp.raw, "")
+                }
+        resp = SEC_SESSION.get(SEC_TICKER_URL, timeout=20)
     resp.raise_for_status()
-    for row in resp.json().values():
-        if row.get("ticker", "").upper() == ticker.upper():
-            return str(row["cik_str"]).zfill(10)
-    return None
+    return {
+        row["ticker"].upper(): str(row["cik_str"]).zfill(10)
+        for row in resp.json().values()
+    }
+
+
+def get_cik_for_ticker(ticker: str) -> str | None:
+    global _ticker_map, _ticker_map_expires
+    now = time.time()
+    if now >= _ticker_map_expires:
+        with _ticker_map_lock:
+            if now >= _ticker_map_expires:
+                try:
+                    _ticker_map = fetch_ticker_map()
+                    _ticker_map_expires = now + TICKER_MAP_TTL
+                except Exception:
+                    if not _ticker_map:
+                        raise
+                    # Serve the stale map rather than failing lookups; retry
+                    # the refresh on a shorter fuse.
+                    log.warning("SEC ticker map refresh failed; serving stale map")
+                    _ticker_map_expires = now + 600.0
+    return _ticker_map.get(ticker.upper())
 
 
 def get_sec_filings(ticker: str) -> dict[str, Any]:
+    key = ticker.upper()
+    now = time.monotonic()
+    cached = _filings_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    result = fetch_sec_filings(ticker)
+    with _filings_lock:
+        _filings_cache[key] = (now + FILINGS_TTL, result)
+    return result
+
+
+def fetch_sec_filings(ticker: str) -> dict[str, Any]:
     cik = get_cik_for_ticker(ticker)
     if not cik:
         return {"cik": None, "latest_10k": None, "latest_10q": None, "fiscal_year_end": None}
 
-    subm = requests.get(SEC_SUBMISSIONS_URL.format(cik=cik), headers=get_sec_headers(), timeout=20)
+    with SEC_SEM:
+        subm = SEC_SESSION.get(SEC_SUBMISSIONS_URL.format(cik=cik), timeout=20)
     subm.raise_for_status()
     data = subm.json()
     recent = data.get("filings", {}).get("recent", {})
 
-    latest_10k = None
-    latest_10q = None
     forms = recent.get("form", [])
     accessions = recent.get("accessionNumber", [])
     docs = recent.get("primaryDocument", [])
     dates = recent.get("filingDate", [])
 
-    for i, form in enumerate(forms):
-        if form in {"10-K", "10-Q"}:
-            acc = accessions[i].replace("-", "")
-            payload = {
-                "filing_date": dates[i],
-                "url": f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{acc}/{docs[i]}",
-            }
-            if form == "10-K" and latest_10k is None:
-                latest_10k = payload
-            if form == "10-Q" and latest_10q is None:
-                latest_10q = payload
-        if latest_10k and latest_10q:
-            break
+    def filing_at(i: int) -> dict[str, str]:
+        return {
+            "filing_date": dates[i],
+            "url": f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{accessions[i].replace('-', '')}/{docs[i]}",
+        }
+
+    # recent is reverse-chronological, so the first match of each form is the
+    # latest filing; list.index does the scan in C.
+    try:
+        latest_10k = filing_at(forms.index("10-K"))
+    except ValueError:
+        latest_10k = None
+    try:
+        latest_10q = filing_at(forms.index("10-Q"))
+    except ValueError:
+        latest_10q = None
 
     return {
         "cik": cik,
@@ -95,124 +291,318 @@ def get_sec_filings(ticker: str) -> dict[str, Any]:
     }
 
 
-def get_statement_line(df: pd.DataFrame | None, candidates: list[str], col: Any) -> float | None:
-    if df is None or df.empty or col not in df.columns:
+def index_statement(df: pd.DataFrame | None) -> tuple[dict[str, np.ndarray], dict[Any, int]]:
+    """Pre-index a statement as {row label: values} plus {column: position}.
+
+    Label resolution through pandas (.loc plus Index membership tests) is the
+    dominant cost of the dozens of per-cell reads below; a pair of dicts makes
+    each read two hash lookups and one array index.
+    """
+    if df is None or df.empty:
+        return {}, {}
+    values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+    rows = {str(label): values[i] for i, label in enumerate(df.index)}
+    cols = {col: i for i, col in enumerate(df.columns)}
+    return rows, cols
+
+
+def statement_cell(rows: dict[str, np.ndarray], pos: int | None, candidates: list[str]) -> float | None:
+    if pos is None:
         return None
     for c in candidates:
-        if c in df.index:
-            val = df.loc[c, col]
+        arr = rows.get(c)
+        if arr is not None:
+            val = arr[pos]
             return float(val) if pd.notna(val) else None
     return None
 
 
-def ttm_sum(df: pd.DataFrame | None, keys: list[str]) -> float | None:
-    if df is None or df.empty or len(df.columns) < 4:
+def extract_batch(rows: dict[str, np.ndarray], pos: int | None, name_map: dict[str, list[str]]) -> dict[str, float | None]:
+    """Read a map of named line items from one statement column in one pass."""
+    return {name: statement_cell(rows, pos, candidates) for name, candidates in name_map.items()}
+
+
+def ttm_sum(rows: dict[str, np.ndarray], cols: dict[Any, int], keys: list[str]) -> float | None:
+    if len(cols) < 4:
         return None
-    vals: list[float] = []
-    for col in list(df.columns[:4]):
-        v = get_statement_line(df, keys, col)
-        if v is None:
-            return None
-        vals.append(v)
-    return float(sum(vals))
+    arr = next((rows[k] for k in keys if k in rows), None)
+    if arr is None:
+        return None
+    vals = np.asarray(arr[:4], dtype=np.float64)
+    if np.isnan(vals).any():
+        return None
+    return float(vals.sum())
+
+
+def dcf_kernel(
+    base_fcf: float, growth: float, wacc: float, tg: float, net_debt: float, shares: float
+) -> tuple[float, float, float, np.ndarray, np.ndarray]:
+    """5-year DCF plus the 2x3 (WACC x terminal growth) sensitivity grid.
+
+    Pure scalar/array math with no Python objects so numba can compile it in
+    nopython mode; cells where WACC <= g come back as NaN.
+    """
+    yrs = np.arange(1.0, 6.0)
+    fcfs = base_fcf * (1 + growth) ** yrs
+    disc = (1 + wacc) ** yrs
+    terminal = (fcfs[-1] * (1 + tg)) / (wacc - tg)
+    ev = (fcfs / disc).sum() + terminal / disc[-1]
+    eq = ev - net_debt
+    intrinsic = eq / shares
+
+    w_vals = np.array([wacc - 0.01, wacc + 0.01])
+    g_vals = np.array([tg - 0.01, tg, tg + 0.01])
+    iv_grid = np.empty((2, 3))
+    # Discount factors depend only on WACC, so build them once per row and
+    # reuse across the three terminal-growth cells.
+    for i in range(2):
+        w = w_vals[i]
+        disc_w = (1 + w) ** yrs
+        pv = (fcfs / disc_w).sum()
+        disc5 = disc_w[-1]
+        for j in range(3):
+            g = g_vals[j]
+            if w <= g:
+                iv_grid[i, j] = np.nan
+            else:
+                iv_grid[i, j] = (pv + fcfs[-1] * (1 + g) / ((w - g) * disc5) - net_debt) / shares
+    return ev, eq, intrinsic, w_vals, iv_grid
+
+
+if njit is not None:
+    dcf_kernel = njit(cache=True)(dcf_kernel)
+    dcf_kernel(1.0, 0.04, 0.08, 0.02, 0.0, 1.0)  # warm the JIT at import
+
+
+def statement_row(rows: dict[str, np.ndarray], positions: list[int | None], candidates: list[str]) -> np.ndarray:
+    """Sample the first matching candidate row at the given column positions."""
+    out = np.full(len(positions), np.nan)
+    arr = next((rows[c] for c in candidates if c in rows), None)
+    if arr is not None:
+        for j, pos in enumerate(positions):
+            if pos is not None:
+                out[j] = arr[pos]
+    return out
+
+
+def none_if_nan(value: float) -> float | None:
+    return float(value) if np.isfinite(value) else None
+
+
+def pct_or_nm(value: float) -> str:
+    return f"{value * 100:.2f}%" if np.isfinite(value) else "N/M"
+
+
+def fetch_chart(symbol: str, range_: str, interval: str) -> tuple[np.ndarray, np.ndarray]:
+    """Fetch (timestamps, closes) straight from Yahoo's chart endpoint.
+
+    Skips yfinance's Ticker/DataFrame construction for call sites that only
+    need close prices.
+    """
+    with YF_SEM:
+        resp = requests.get(
+            YAHOO_CHART_URL.format(symbol=symbol),
+            params={"range": range_, "interval": interval},
+            headers=YAHOO_HEADERS,
+            timeout=20,
+        )
+    resp.raise_for_status()
+    result = resp.json()["chart"]["result"][0]
+    ts = np.asarray(result["timestamp"], dtype=np.int64)
+    close = np.asarray(result["indicators"]["quote"][0]["close"], dtype=np.float64)
+    mask = ~np.isnan(close)
+    return ts[mask], close[mask]
+
+
+# The 10Y yield is identical across tickers; share one fetch per window.
+RISK_FREE_TTL = 900.0
+_rf_cache: tuple[float, float | None] = (0.0, None)
+_rf_lock = threading.Lock()
+
+
+def get_price_history(ticker: str, tk: yf.Ticker, period: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return (dates as YYYY-MM-DD strings, closes) for the daily chart.
+
+    Only those two columns are ever consumed, so skip yfinance's full OHLCV
+    DataFrame (parse, tz conversion, 8 columns) and read the chart endpoint
+    directly; yfinance remains as the fallback.
+    """
+    try:
+        ts, close = fetch_chart(ticker, period, "1d")
+        dates = np.datetime_as_string(ts.astype("datetime64[s]").astype("datetime64[D]"))
+        return dates, close
+    except Exception:
+        hist = yf_limited(lambda: tk.history(period=period, interval="1d")).reset_index()
+        if hist.empty:
+            return np.array([], dtype=str), np.array([], dtype=np.float64)
+        return (
+            hist["Date"].dt.strftime("%Y-%m-%d").to_numpy(),
+            hist["Close"].to_numpy(dtype=np.float64),
+        )
 
 
 def get_risk_free_rate() -> float | None:
+    global _rf_cache
+    now = time.monotonic()
+    expires, value = _rf_cache
+    if now < expires:
+        return value
+    with _rf_lock:
+        expires, value = _rf_cache
+        if now < expires:
+            return value
+        value = fetch_risk_free_rate()
+        _rf_cache = (now + RISK_FREE_TTL, value)
+    return value
+
+
+def fetch_risk_free_rate() -> float | None:
     # ^TNX is 10Y Treasury yield * 10, so divide by 100 for decimal
-    tnx = yf.Ticker("^TNX").history(period="5d", interval="1d")
-    if tnx.empty:
+    try:
+        _, close = fetch_chart("^TNX", "5d", "1d")
+    except Exception:
+        tnx = yf_limited(lambda: yf.Ticker("^TNX").history(period="5d", interval="1d"))
+        if tnx.empty:
+            return None
+        return float(tnx["Close"].iloc[-1]) / 100.0
+    if close.size == 0:
         return None
-    return float(tnx["Close"].iloc[-1]) / 100.0
+    return float(close[-1]) / 100.0
 
 
 def get_beta_5y_monthly(ticker: str) -> float | None:
-    stock = yf.Ticker(ticker).history(period="5y", interval="1mo")
-    market = yf.Ticker("^GSPC").history(period="5y", interval="1mo")
-    if stock.empty or market.empty:
+    try:
+        s_ts, s_close = fetch_chart(ticker, "5y", "1mo")
+        m_ts, m_close = fetch_chart("^GSPC", "5y", "1mo")
+    except Exception:
         return None
 
-    s = stock["Close"].pct_change().dropna()
-    m = market["Close"].pct_change().dropna()
-    joined = pd.concat([s, m], axis=1, join="inner").dropna()
-    if joined.empty:
+    # Align the two series on shared bar timestamps, then compute simple
+    # returns and beta directly on float64 arrays.
+    _, s_idx, m_idx = np.intersect1d(s_ts, m_ts, return_indices=True)
+    s = s_close[s_idx]
+    m = m_close[m_idx]
+    if s.size < 3:
         return None
 
-    joined.columns = ["s", "m"]
-    var_m = joined["m"].var()
-    if var_m == 0:
+    sr = s[1:] / s[:-1] - 1.0
+    mr = m[1:] / m[:-1] - 1.0
+    cov = np.cov(sr, mr, ddof=1)
+    if cov[1, 1] == 0:
         return None
-    cov = joined["s"].cov(joined["m"])
-    return float(cov / var_m)
+    return float(cov[0, 1] / cov[1, 1])
+
 
+def get_market_snapshot(tk: yf.Ticker) -> dict[str, Any]:
+    """Market cap and share count via fast_info.
 
-def build_response(ticker: str) -> dict[str, Any]:
-    tk = yf.Ticker(ticker)
-    info = tk.info or {}
-    hist = tk.history(period="10y", interval="1d").reset_index()
-    if hist.empty:
+    fast_info answers from lightweight price endpoints; the full tk.info
+    quote-summary scrape is only hit as a fallback when either value is
+    missing.
+    """
+    cap = shares = None
+    try:
+        fi = tk.fast_info
+        with YF_SEM:
+            cap, shares = fi.market_cap, fi.shares
+    except Exception:
+        pass
+    if cap is None or shares is None:
+        info = yf_limited(lambda: tk.info) or {}
+        cap = cap if cap is not None else info.get("marketCap")
+        shares = shares if shares is not None else info.get("sharesOutstanding") or info.get("impliedSharesOutstanding")
+    return {"market_cap": cap, "shares": shares}
+
+
+def fetch_result(fut: Future, ticker: str, what: str, default: Any = None) -> Any:
+    try:
+        return fut.result(timeout=FETCH_TIMEOUT)
+    except Exception as exc:
+        log.warning("%s fetch failed for %s: %s", what, ticker, exc)
+        return default
+
+
+def build_response(ticker: str, period: str = DEFAULT_CHART_PERIOD) -> dict[str, Any]:
+    ticker = ticker.upper()
+    tk = yf.Ticker(ticker, session=YF_SESSION)
+
+    # All fetches are independent network round-trips; fan them out so the
+    # request costs roughly the slowest call instead of the sum.
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        fut_sec = ex.submit(get_sec_filings, ticker)
+        fut_hist = ex.submit(get_price_history, ticker, tk, period)
+        fut_rf = ex.submit(get_risk_free_rate)
+        fut_beta = ex.submit(get_beta_5y_monthly, ticker)
+        fut_info = ex.submit(get_market_snapshot, tk)
+        # Each statement property is its own lazy HTTP fetch; submitting them
+        # individually lets all five download concurrently, and each frame is
+        # fetched exactly once per request.
+        fut_income = ex.submit(yf_limited, lambda: tk.income_stmt)
+        fut_balance = ex.submit(yf_limited, lambda: tk.balance_sheet)
+        fut_cashflow = ex.submit(yf_limited, lambda: tk.cashflow)
+        fut_q_income = ex.submit(yf_limited, lambda: tk.quarterly_income_stmt)
+        fut_q_cashflow = ex.submit(yf_limited, lambda: tk.quarterly_cashflow)
+
+        sec = fetch_result(fut_sec, ticker, "SEC filings", {"cik": None, "latest_10k": None, "latest_10q": None, "fiscal_year_end": None})
+        hist_dates, hist_close = fetch_result(fut_hist, ticker, "price history", (np.array([], dtype=str), np.array([], dtype=np.float64)))
+        risk_free = fetch_result(fut_rf, ticker, "risk-free rate")
+        beta_5y = fetch_result(fut_beta, ticker, "beta")
+        snapshot = fetch_result(fut_info, ticker, "market snapshot", {"market_cap": None, "shares": None})
+        income = fetch_result(fut_income, ticker, "income statement", pd.DataFrame())
+        balance = fetch_result(fut_balance, ticker, "balance sheet", pd.DataFrame())
+        cashflow = fetch_result(fut_cashflow, ticker, "cash flow statement", pd.DataFrame())
+        q_income = fetch_result(fut_q_income, ticker, "quarterly income statement", pd.DataFrame())
+        q_cashflow = fetch_result(fut_q_cashflow, ticker, "quarterly cash flow statement", pd.DataFrame())
+
+    if hist_close.size == 0:
         raise ValueError("Ticker history unavailable")
 
-    sec = get_sec_filings(ticker)
-
-    income = tk.income_stmt
-    balance = tk.balance_sheet
-    cashflow = tk.cashflow
-    q_income = tk.quarterly_income_stmt
-    q_cashflow = tk.quarterly_cashflow
-
-    price = float(hist.iloc[-1]["Close"])
-    market_cap = info.get("marketCap")
-    shares = info.get("sharesOutstanding") or info.get("impliedSharesOutstanding")
-
-    latest_col = income.columns[0] if not income.empty else None
-    prev_col = income.columns[1] if income.shape[1] > 1 else None
-    bs_col = balance.columns[0] if not balance.empty else None
-    bs_prev = balance.columns[1] if balance.shape[1] > 1 else None
-    cf_col = cashflow.columns[0] if not cashflow.empty else None
-
-    rev = get_statement_line(income, ["Total Revenue"], latest_col)
-    cogs = get_statement_line(income, ["Cost Of Revenue"], latest_col)
-    gross = get_statement_line(income, ["Gross Profit"], latest_col)
-    sga = get_statement_line(income, ["Selling General And Administration"], latest_col)
-    rnd = get_statement_line(income, ["Research And Development"], latest_col)
-    ebit = get_statement_line(income, ["Operating Income", "EBIT"], latest_col)
-    da = get_statement_line(cashflow, ["Depreciation And Amortization", "Depreciation"], cf_col)
-    interest = get_statement_line(income, ["Interest Expense", "Interest Expense Non Operating"], latest_col)
-    taxes = get_statement_line(income, ["Tax Provision"], latest_col)
-    net_income = get_statement_line(income, ["Net Income"], latest_col)
-
-    cash = get_statement_line(balance, ["Cash Cash Equivalents And Short Term Investments", "Cash And Cash Equivalents"], bs_col)
-    ar = get_statement_line(balance, ["Accounts Receivable"], bs_col)
-    inventory = get_statement_line(balance, ["Inventory"], bs_col)
-    other_ca = get_statement_line(balance, ["Other Current Assets"], bs_col)
-    current_assets = get_statement_line(balance, ["Current Assets"], bs_col)
-    current_liab = get_statement_line(balance, ["Current Liabilities"], bs_col)
-    ap = get_statement_line(balance, ["Accounts Payable"], bs_col)
-    accrued = get_statement_line(balance, ["Accrued Expenses"], bs_col)
-    deferred = get_statement_line(balance, ["Deferred Revenue"], bs_col)
-    current_debt = get_statement_line(balance, ["Current Debt", "Current Debt And Capital Lease Obligation"], bs_col)
-    ltd = get_statement_line(balance, ["Long Term Debt", "Long Term Debt And Capital Lease Obligation"], bs_col)
-    lease = get_statement_line(balance, ["Operating Lease Liability", "Long Term Lease Liability"], bs_col)
-    total_assets = get_statement_line(balance, ["Total Assets"], bs_col)
-    equity = get_statement_line(balance, ["Stockholders Equity", "Total Equity Gross Minority Interest"], bs_col)
-
-    cfo = get_statement_line(cashflow, ["Operating Cash Flow"], cf_col)
-    capex_raw = get_statement_line(cashflow, ["Capital Expenditure"], cf_col)
+    inc_rows, inc_cols = index_statement(income)
+    bs_rows, bs_cols = index_statement(balance)
+    cf_rows, cf_cols = index_statement(cashflow)
+    qi_rows, qi_cols = index_statement(q_income)
+    qcf_rows, qcf_cols = index_statement(q_cashflow)
+
+    price = float(hist_close[-1])
+    market_cap = snapshot["market_cap"]
+    shares = snapshot["shares"]
+
+    # Column 0 is the latest FY by construction, so FY cell reads use fixed
+    # positions instead of hashing column labels on every call.
+    inc_latest = 0 if inc_cols else None
+    inc_prev = 1 if len(inc_cols) > 1 else None
+    bs_latest = 0 if bs_cols else None
+    cf_latest = 0 if cf_cols else None
+
+    fy_inc = extract_batch(inc_rows, inc_latest, INCOME_FY_LINES)
+    rev, cogs, gross, sga, rnd, ebit, interest, taxes, net_income = (fy_inc[k] for k in INCOME_FY_LINES)
+
+    fy_bs = extract_batch(bs_rows, bs_latest, BALANCE_FY_LINES)
+    (
+        cash, ar, inventory, other_ca, current_assets, current_liab, ap, accrued,
+        deferred, current_debt, ltd, lease, total_assets, equity,
+    ) = (fy_bs[k] for k in BALANCE_FY_LINES)
+
+    fy_cf = extract_batch(cf_rows, cf_latest, CASHFLOW_FY_LINES)
+    cfo, capex_raw, da = (fy_cf[k] for k in CASHFLOW_FY_LINES)
     capex = abs(capex_raw) if capex_raw is not None else None
     fcf = cfo - capex if cfo is not None and capex is not None else None
 
-    rev_ttm = ttm_sum(q_income, ["Total Revenue"])
-    ni_ttm = ttm_sum(q_income, ["Net Income"])
-    cfo_ttm = ttm_sum(q_cashflow, ["Operating Cash Flow"])
-    capex_ttm_raw = ttm_sum(q_cashflow, ["Capital Expenditure"])
+    rev_ttm = ttm_sum(qi_rows, qi_cols, ["Total Revenue"])
+    ni_ttm = ttm_sum(qi_rows, qi_cols, ["Net Income"])
+    cfo_ttm = ttm_sum(qcf_rows, qcf_cols, ["Operating Cash Flow"])
+    capex_ttm_raw = ttm_sum(qcf_rows, qcf_cols, ["Capital Expenditure"])
     capex_ttm = abs(capex_ttm_raw) if capex_ttm_raw is not None else None
     fcf_ttm = cfo_ttm - capex_ttm if cfo_ttm is not None and capex_ttm is not None else fcf
 
-    debt_total = (current_debt or 0.0) + (ltd or 0.0)
-    debt_prev = (
-        (get_statement_line(balance, ["Current Debt", "Current Debt And Capital Lease Obligation"], bs_prev) or 0.0)
-        + (get_statement_line(balance, ["Long Term Debt", "Long Term Debt And Capital Lease Obligation"], bs_prev) or 0.0)
-    )
+    # Total debt for every balance-sheet column in one pass; the vector serves
+    # the latest FY, the prior FY, and the 5-year table below.
+    bs_n = len(bs_cols)
+    cd_all = next((np.nan_to_num(np.asarray(bs_rows[r], dtype=np.float64)) for r in CURRENT_DEBT_ROWS if r in bs_rows), np.zeros(bs_n))
+    ltd_all = next((np.nan_to_num(np.asarray(bs_rows[r], dtype=np.float64)) for r in LONG_TERM_DEBT_ROWS if r in bs_rows), np.zeros(bs_n))
+    debt_all = cd_all + ltd_all
+    debt_total = float(debt_all[0]) if bs_n else 0.0
+    debt_prev = float(debt_all[1]) if bs_n > 1 else 0.0
     avg_debt = (debt_total + debt_prev) / 2 if (debt_total or debt_prev) else None
 
     ebitda_ttm = (ebit or 0.0) + (da or 0.0)
@@ -223,14 +613,29 @@ def build_response(ticker: str) -> dict[str, Any]:
     pb = nm_ratio(price, safe_div(equity, shares), require_positive_denominator=True)
     ps = nm_ratio(price, safe_div(rev_ttm, shares), require_positive_denominator=True)
     eps_growth = None
-    if latest_col is not None and prev_col is not None:
-        ni_prev = get_statement_line(income, ["Net Income"], prev_col)
+    if inc_prev is not None:
+        ni_prev = statement_cell(inc_rows, inc_prev, ["Net Income"])
         if ni_prev not in (None, 0):
             eps_growth = (net_income - ni_prev) / abs(ni_prev) if net_income is not None else None
     peg = "N/M"
     if isinstance(pe, float) and eps_growth not in (None, 0):
         peg = pe / (eps_growth * 100)
 
+    # All six profitability percentages in one grouped divide (None becomes
+    # NaN in the float arrays and comes out as N/M).
+    invested_capital = (equity or 0.0) + debt_total - (cash or 0.0)
+    prof_num = np.array([gross, ebit, net_income, net_income, net_income, nopat], dtype=np.float64)
+    prof_den = np.array([rev, rev, rev, equity, total_assets, invested_capital], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prof = prof_num / prof_den
+    prof[prof_den == 0] = np.nan
+    profitability = dict(
+        zip(
+            ["Gross margin (FY)", "Operating margin (FY)", "Net margin (FY)", "ROE (FY)", "ROA (FY)", "ROIC (FY)"],
+            (pct_or_nm(v) for v in prof),
+        )
+    )
+
     metrics = {
         "valuation": {
             "P/E (TTM)": pe,
@@ -242,14 +647,7 @@ def build_response(ticker: str) -> dict[str, Any]:
             "EV/NOPAT (TTM proxy)": nm_ratio(enterprise_value, nopat, require_positive_denominator=True),
             "Price / Cash Flow (TTM)": nm_ratio(price, safe_div(cfo_ttm, shares), require_positive_denominator=True),
         },
-        "profitability": {
-            "Gross margin (FY)": nm_percent(gross, rev),
-            "Operating margin (FY)": nm_percent(ebit, rev),
-            "Net margin (FY)": nm_percent(net_income, rev),
-            "ROE (FY)": nm_percent(net_income, equity),
-            "ROA (FY)": nm_percent(net_income, total_assets),
-            "ROIC (FY)": nm_percent(nopat, (equity or 0.0) + debt_total - (cash or 0.0)),
-        },
+        "profitability": profitability,
         "leverage": {
             "Debt / Equity (FY)": nm_ratio(debt_total, equity, require_positive_denominator=True),
             "Debt / EBITDA (TTM proxy)": nm_ratio(debt_total, ebitda_ttm, require_positive_denominator=True),
@@ -269,8 +667,6 @@ def build_response(ticker: str) -> dict[str, Any]:
         },
     }
 
-    risk_free = get_risk_free_rate()
-    beta_5y = get_beta_5y_monthly(ticker)
     cost_of_equity = (risk_free + beta_5y * DEFAULT_ERP) if risk_free is not None and beta_5y is not None else None
     cost_of_debt = safe_div(abs(interest) if interest is not None else None, avg_debt)
 
@@ -288,70 +684,71 @@ def build_response(ticker: str) -> dict[str, Any]:
     base_fcf = fcf_ttm
     if base_fcf is not None and wacc is not None and wacc > DEFAULT_TERMINAL_GROWTH and shares:
         growth = 0.04
-        fcfs = [base_fcf * ((1 + growth) ** yr) for yr in range(1, 6)]
-        pv_fcfs = [fcf_i / ((1 + wacc) ** i) for i, fcf_i in enumerate(fcfs, 1)]
-        terminal = (fcfs[-1] * (1 + DEFAULT_TERMINAL_GROWTH)) / (wacc - DEFAULT_TERMINAL_GROWTH)
-        ev = sum(pv_fcfs) + terminal / ((1 + wacc) ** 5)
-        eq = ev - net_debt
-        intrinsic = safe_div(eq, shares)
-
-        sensitivity: list[dict[str, Any]] = []
-        for w in [wacc - 0.01, wacc + 0.01]:
-            row_vals: list[float | None] = []
-            for g in [DEFAULT_TERMINAL_GROWTH - 0.01, DEFAULT_TERMINAL_GROWTH, DEFAULT_TERMINAL_GROWTH + 0.01]:
-                if w <= g:
-                    row_vals.append(None)
-                    continue
-                terminal_s = (fcfs[-1] * (1 + g)) / (w - g)
-                ev_s = sum([f / ((1 + w) ** i) for i, f in enumerate(fcfs, 1)]) + terminal_s / ((1 + w) ** 5)
-                row_vals.append(safe_div(ev_s - net_debt, shares))
-            sensitivity.append({"wacc": w, "values": row_vals})
+        ev, eq, intrinsic, w_vals, iv_grid = dcf_kernel(
+            float(base_fcf), growth, float(wacc), DEFAULT_TERMINAL_GROWTH, float(net_debt), float(shares)
+        )
+        sensitivity: list[dict[str, Any]] = [
+            {"wacc": float(w), "values": [none_if_nan(v) for v in row]}
+            for w, row in zip(w_vals, iv_grid)
+        ]
 
         dcf = {
             "base_fcf_ttm": base_fcf,
             "growth_assumption": growth,
             "terminal_growth": DEFAULT_TERMINAL_GROWTH,
-            "enterprise_value": ev,
-            "equity_value": eq,
-            "intrinsic_value_per_share": intrinsic,
+            "enterprise_value": float(ev),
+            "equity_value": float(eq),
+            "intrinsic_value_per_share": float(intrinsic),
             "sensitivity_2x3": sensitivity,
         }
 
-    hist_5y: list[dict[str, Any]] = []
-    for col in list(income.columns[:5]):
-        yr = col.year if hasattr(col, "year") else str(col)
-        yr_rev = get_statement_line(income, ["Total Revenue"], col)
-        yr_gp = get_statement_line(income, ["Gross Profit"], col)
-        yr_ebit = get_statement_line(income, ["Operating Income", "EBIT"], col)
-        yr_ni = get_statement_line(income, ["Net Income"], col)
-        yr_cfo = get_statement_line(cashflow, ["Operating Cash Flow"], col)
-        yr_capex = get_statement_line(cashflow, ["Capital Expenditure"], col)
-        yr_da = get_statement_line(cashflow, ["Depreciation And Amortization", "Depreciation"], col)
-        hist_5y.append(
-            {
-                "FY": str(yr),
-                "Revenue": yr_rev,
-                "Gross margin": safe_div(yr_gp, yr_rev),
-                "Operating margin": safe_div(yr_ebit, yr_rev),
-                "Net margin": safe_div(yr_ni, yr_rev),
-                "EBITDA": (yr_ebit or 0.0) + (yr_da or 0.0),
-                "FCF": (yr_cfo - abs(yr_capex)) if yr_cfo is not None and yr_capex is not None else None,
-                "Cash": get_statement_line(balance, ["Cash Cash Equivalents And Short Term Investments", "Cash And Cash Equivalents"], col),
-                "Debt": (
-                    (get_statement_line(balance, ["Long Term Debt", "Long Term Debt And Capital Lease Obligation"], col) or 0.0)
-                    + (get_statement_line(balance, ["Current Debt", "Current Debt And Capital Lease Obligation"], col) or 0.0)
-                ),
-                "Current ratio": safe_div(
-                    get_statement_line(balance, ["Current Assets"], col),
-                    get_statement_line(balance, ["Current Liabilities"], col),
-                ),
-            }
-        )
+    # Build the 5-year table from whole row vectors instead of per-cell reads:
+    # one candidate resolution per line item, then elementwise arithmetic.
+    cols5 = list(income.columns[:5])
+    inc_pos5 = [inc_cols.get(c) for c in cols5]
+    bs_pos5 = [bs_cols.get(c) for c in cols5]
+    cf_pos5 = [cf_cols.get(c) for c in cols5]
+
+    rev5 = statement_row(inc_rows, inc_pos5, ["Total Revenue"])
+    gp5 = statement_row(inc_rows, inc_pos5, ["Gross Profit"])
+    ebit5 = statement_row(inc_rows, inc_pos5, ["Operating Income", "EBIT"])
+    ni5 = statement_row(inc_rows, inc_pos5, ["Net Income"])
+    cfo5 = statement_row(cf_rows, cf_pos5, ["Operating Cash Flow"])
+    capex5 = statement_row(cf_rows, cf_pos5, ["Capital Expenditure"])
+    da5 = statement_row(cf_rows, cf_pos5, ["Depreciation And Amortization", "Depreciation"])
+    cash5 = statement_row(bs_rows, bs_pos5, ["Cash Cash Equivalents And Short Term Investments", "Cash And Cash Equivalents"])
+    ca5 = statement_row(bs_rows, bs_pos5, ["Current Assets"])
+    cl5 = statement_row(bs_rows, bs_pos5, ["Current Liabilities"])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gm5 = gp5 / rev5
+        om5 = ebit5 / rev5
+        netm5 = ni5 / rev5
+        curr5 = ca5 / cl5
+    ebitda5 = np.nan_to_num(ebit5) + np.nan_to_num(da5)
+    fcf5 = cfo5 - np.abs(capex5)
+    debt5 = np.array([debt_all[p] if p is not None else 0.0 for p in bs_pos5])
+
+    hist_5y: list[dict[str, Any]] = [
+        {
+            "FY": str(col.year if hasattr(col, "year") else col),
+            "Revenue": none_if_nan(rev5[j]),
+            "Gross margin": none_if_nan(gm5[j]),
+            "Operating margin": none_if_nan(om5[j]),
+            "Net margin": none_if_nan(netm5[j]),
+            "EBITDA": float(ebitda5[j]),
+            "FCF": none_if_nan(fcf5[j]),
+            "Cash": none_if_nan(cash5[j]),
+            "Debt": float(debt5[j]),
+            "Current ratio": none_if_nan(curr5[j]),
+        }
+        for j, col in enumerate(cols5)
+    ]
 
     upside = safe_div((dcf["intrinsic_value_per_share"] - price), price) if dcf and dcf.get("intrinsic_value_per_share") is not None else None
 
     return {
-        "ticker": ticker.upper(),
+        "ticker": ticker,
         "as_of": datetime.utcnow().isoformat() + "Z",
         "price_snapshot": {
             "current_price": price,
@@ -420,8 +817,10 @@ def build_response(ticker: str) -> dict[str, Any]:
         "dcf": dcf,
         "historical_5y": hist_5y,
         "chart": {
-            "dates": [d.strftime("%Y-%m-%d") for d in hist["Date"]],
-            "close": [float(v) for v in hist["Close"]],
+            # orjson can't serialize unicode ndarrays, so dates become a list;
+            # the float close array goes to the serializer as-is.
+            "dates": hist_dates.tolist(),
+            "close": hist_close,
         },
         "assumptions": [
             "Baseline uses latest FY plus prior FY, with TTM for valuation/DCF inputs.",
@@ -437,6 +836,39 @@ def build_response(ticker: str) -> dict[str, Any]:
     }
 
 
+def fastjson(data: Any, status: int = 200) -> Response:
+    return app.response_class(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype="application/json")
+
+
+def stream_sections(data: dict[str, Any]):
+    """Yield the payload serialized one top-level section at a time.
+
+    build_serialized exhausts this into a tuple for lru_cache, so there is
+    no memory win any more; the chunks exist so cached responses can be
+    replayed and sent with chunked transfer instead of re-serializing the
+    document per hit.
+    """
+    yield b"{"
+    for i, (key, value) in enumerate(data.items()):
+        prefix = b"," if i else b""
+        yield prefix + orjson.dumps(key) + b":" + orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    yield b"}"
+
+
+RESPONSE_CACHE_SECONDS = 60
+
+
+@functools.lru_cache(maxsize=256)
+def build_serialized(ticker: str, period: str, bucket: int) -> tuple[bytes, ...]:
+    """Serialized response chunks for one ticker and one time bucket.
+
+    Repeat hits within the bucket skip the whole network fan-out and the
+    serialization; `bucket` only exists to expire entries, and failures are
+    not cached because lru_cache does not memoize raised exceptions.
+    """
+    return tuple(stream_sections(build_response(ticker, period)))
+
+
 @app.route("/")
 def index() -> str:
     return render_template("index.html")
@@ -447,11 +879,15 @@ def analyze() -> Any:
     body = request.get_json(force=True)
     ticker = (body.get("ticker") or "").strip().upper()
     if not ticker:
-        return jsonify({"error": "Ticker is required"}), 400
+        return fastjson({"error": "Ticker is required"}, 400)
+    period = (body.get("period") or DEFAULT_CHART_PERIOD).strip().lower()
+    if period not in CHART_PERIODS:
+        return fastjson({"error": f"period must be one of {sorted(CHART_PERIODS)}"}, 400)
     try:
-        return jsonify(build_response(ticker))
+        chunks = build_serialized(ticker, period, int(time.time()) // RESPONSE_CACHE_SECONDS)
     except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
+        return fastjson({"error": str(exc)}, 500)
+    return Response(iter(chunks), mimetype="application/json")
 
 
 if __name__ == "__main__":
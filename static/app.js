@@ -109,6 +109,7 @@ function renderOutput(d) {
 form.addEventListener('submit', async (e) => {
   e.preventDefault();
   const ticker = document.getElementById('ticker').value.trim();
+  const period = document.getElementById('period').value;
   statusEl.textContent = 'Running filing-first analysis...';
   outputEl.innerHTML = '';
 
@@ -116,7 +117,7 @@ form.addEventListener('submit', async (e) => {
     const res = await fetch('/api/analyze', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ ticker }),
+      body: JSON.stringify({ ticker, period }),
     });
     const data = await res.json();
     if (!res.ok) throw new Error(data.error || 'Request failed');
@@ -0,0 +1,72 @@
+"""Regression tests for fetch_ticker_map's session/parser interaction.
+
+The ijson streaming path must never run through a CachedSession:
+requests-cache replays bodies it already decoded while the stored headers
+still advertise gzip, so raw-stream reads double-decompress on a cache miss
+(urllib3 DecodeError) and hit EOF on a cache hit (ijson IncompleteJSONError).
+"""
+import io
+import json
+
+import pytest
+
+app = pytest.importorskip("app")
+
+SAMPLE = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 789019, "ticker": "MSFT", "title": "Microsoft Corp"},
+}
+EXPECTED = {"AAPL": "0000320193", "MSFT": "0000789019"}
+
+
+class FakeRaw(io.BytesIO):
+    # Subclassed so decode_content is assignable, as on urllib3's response.
+    decode_content = False
+
+
+class FakeResponse:
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+        self.raw = FakeRaw(json.dumps(payload).encode())
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self._payload
+
+    def __enter__(self) -> "FakeResponse":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.stream_requested = False
+
+    def get(self, url, timeout=None, stream=False):
+        self.stream_requested = self.stream_requested or stream
+        return FakeResponse(SAMPLE)
+
+
+def test_cached_session_parses_in_one_piece(monkeypatch):
+    """With requests-cache installed the raw stream is unusable; the map
+    must come from resp.json() and stream=True must never be requested."""
+    monkeypatch.setattr(app, "CachedSession", object())
+    session = FakeSession()
+    monkeypatch.setattr(app, "SEC_SESSION", session)
+    assert app.fetch_ticker_map() == EXPECTED
+    assert session.stream_requested is False
+
+
+def test_plain_session_streams_through_ijson(monkeypatch):
+    """Without requests-cache the body is parsed incrementally via ijson."""
+    if app.ijson is None:
+        pytest.skip("ijson not installed")
+    monkeypatch.setattr(app, "CachedSession", None)
+    session = FakeSession()
+    monkeypatch.setattr(app, "SEC_SESSION", session)
+    assert app.fetch_ticker_map() == EXPECTED
+    assert session.stream_requested is True